@@ -4,6 +4,8 @@ Does not work if the function uses recursion.
 
 import time
 
+import numpy as np
+
 
 func_start_times = {}
 func_total_times = {}
@@ -36,3 +38,15 @@ def clear(func):
 
 def get_times():
     return func_total_times
+
+
+def save_times(path):
+    """ Save the total times of every function to a NumPy .npz file.
+    Args:
+        path: File path to save to. The file holds two arrays: "names", the
+            function names, and "seconds", the matching total times.
+    """
+    names = list(func_total_times)
+    seconds = [func_total_times[name] for name in names]
+    np.savez(path, names=np.array(names, dtype=str),
+             seconds=np.array(seconds, dtype=np.float64))
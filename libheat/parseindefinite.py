@@ -6,17 +6,21 @@ Parse the indefinite string argument command.
 These are of the format [(AR,SC), (AR,SC), (AR,SC)]
 """
 
+import numpy as np
+
+
 ERR_MSG = "Argument for indefinite not [(AR,SC), ...] format"
 
 
-def parse_ind_arg(s: str) -> list:
+def parse_ind_arg(s: str) -> np.ndarray:
     """Parse an indefinite string argument (passed in by a user)
 
     Args:
         s (str): The argument to parse. Of the format [(AR,SC), ...]
 
     Returns:
-        A list of tuples, representing the arguments.
+        An (N, 2) float array, with one (AR, SC) pair per row. Column 0 holds
+        the AR thresholds and column 1 the SC thresholds.
     """
     stripped_s = s.strip()
     if stripped_s[0] != "[" or stripped_s[-1] != "]":
@@ -41,7 +45,9 @@ def parse_ind_arg(s: str) -> list:
             argument_end = i
             arguments_in_waiting.append(
                 float(stripped_s[argument_start:argument_end]))
-            pairs.append(tuple(arguments_in_waiting))
+            if len(arguments_in_waiting) != 2:
+                raise ValueError(ERR_MSG)
+            pairs.append(arguments_in_waiting)
             arguments_in_waiting = []
         elif in_pair:
             if c == ",":
@@ -49,4 +55,4 @@ def parse_ind_arg(s: str) -> list:
                 arguments_in_waiting.append(
                     float(stripped_s[argument_start:argument_end]))
                 argument_start = i + 1
-    return pairs
+    return np.array(pairs, dtype=np.float64).reshape(-1, 2)
@@ -33,7 +33,6 @@ def dream_table(df, **kwargs):
         `robustness`, and `robustness_pm`.
     """
     # Start setup -------------------------------------------------------------
-    srea = df.loc[df['execution'] == "srea"]
     drea = df.loc[df['execution'] == "drea"]
 
     if "threshold_range" in kwargs:
@@ -46,7 +45,7 @@ def dream_table(df, **kwargs):
     else:
         comparison = drea
 
-    outdf = pd.DataFrame(columns=COLUMNS)
+    rows = []
     # Check naming of arsi/arsc
     naming = "arsc"
     sc_col_name = "sc_threshold"
@@ -75,7 +74,8 @@ def dream_table(df, **kwargs):
                         "send_freq": data.sends[i],
                         "reschedule_freq": data.res[i],
                         "runtime": data.runtimes[i]}
-            outdf = outdf.append(row_dict, ignore_index=True, sort=True)
+            rows.append(row_dict)
+    outdf = _table_from_rows(rows)
 
     # print(outdf)
     #print("DREA Rob: {}".format(drea["robustness"].mean()))
@@ -120,7 +120,7 @@ def dream_gain_table(df, **kwargs):
 
     print(df.head())
 
-    dreamdf = pd.DataFrame(columns=COLUMNS)
+    rows = []
     # Check naming of arsi/arsc
     naming = "arsc"
     sc_col_name = "sc_threshold"
@@ -143,7 +143,8 @@ def dream_gain_table(df, **kwargs):
                         "improv_rob": data.robs[i] - srea["robustness"].mean(),
                         "reschedule_freq": data.res[i],
                         "deployment": data.sends[i]}
-            dreamdf = dreamdf.append(row_dict, ignore_index=True, sort=True)
+            rows.append(row_dict)
+    dreamdf = _table_from_rows(rows)
 
     # Recall, we used to name communications as deployments.
     deployment_metric = dreamdf["improv_rob"] / dreamdf["deployment"]
@@ -175,16 +176,17 @@ def dream_best_ar(df):
     thresholds = list(dream["ar_threshold"].unique())
     data = threshold_means(dream, "ar_threshold", thresholds, error_fac=1,
                            use_percents=False)
-    dream_summary = pd.DataFrame(columns=["robustness",
-                                          "ar_threshold",
-                                          "sc_threshold",
-                                          "reschedule_freq"])
+    rows = []
     for i, ar_thresh in enumerate(thresholds):
         row = {"robustness": data.robs[i],
                "ar_threshold": ar_thresh,
                "sc_threshold": 0,
                "reschedule_freq": data.res[i]}
-        dream_summary = dream_summary.append(row, ignore_index=True)
+        rows.append(row)
+    dream_summary = pd.DataFrame(rows, columns=["robustness",
+                                                "ar_threshold",
+                                                "sc_threshold",
+                                                "reschedule_freq"])
 
     metric = ((dream_summary["robustness"] - float(srea["robustness"].mean()))
               / dream_summary["reschedule_freq"])
@@ -201,16 +203,17 @@ def dream_best_sc(df):
     thresholds = list(dream["si_threshold"].unique())
     data = threshold_means(dream, "si_threshold", thresholds, error_fac=1,
                            use_percents=False)
-    dream_summary = pd.DataFrame(columns=["robustness",
-                                          "ar_threshold",
-                                          "sc_threshold",
-                                          "send_freq"])
+    rows = []
     for i, sc_thresh in enumerate(thresholds):
         row = {"robustness": data.robs[i],
                "ar_threshold": 1.0,
                "sc_threshold": sc_thresh,
                "send_freq": data.sends[i]}
-        dream_summary = dream_summary.append(row, ignore_index=True)
+        rows.append(row)
+    dream_summary = pd.DataFrame(rows, columns=["robustness",
+                                                "ar_threshold",
+                                                "sc_threshold",
+                                                "send_freq"])
 
     metric = ((dream_summary["robustness"] - float(srea["robustness"].mean()))
               / dream_summary["send_freq"])
@@ -219,6 +222,16 @@ def dream_best_sc(df):
     print("SREA robustness: {}".format(srea["robustness"].mean()))
 
 
+def _table_from_rows(rows):
+    """Build an output DataFrame from a list of row dictionaries.
+
+    The columns are COLUMNS plus any other keys found in the rows, sorted by
+    name.
+    """
+    columns = sorted(set(COLUMNS).union(*rows))
+    return pd.DataFrame(rows, columns=columns)
+
+
 def generate_contour_values(df, ar_thresholds, sc_thresholds, coi):
     """
     Args:
@@ -268,7 +281,7 @@ def dream_gain_table_q2(df, **kwargs):
     else:
         comparison = drea
 
-    dreamdf = pd.DataFrame(columns=COLUMNS)
+    rows = []
     # Check naming of arsi/arsc
     naming = "arsc"
     sc_col_name = "sc_threshold"
@@ -294,7 +307,8 @@ def dream_gain_table_q2(df, **kwargs):
                         "deployment": data.sends[i],
                         "runtime": data.runtimes[i],
                         "runtime_pm": data.runtimes_err[i]}
-            dreamdf = dreamdf.append(row_dict, ignore_index=True, sort=True)
+            rows.append(row_dict)
+    dreamdf = _table_from_rows(rows)
 
     deployment_metric_2 = dreamdf["improv_rob"] / dreamdf["runtime"]
     #deployment_metric.rename(index=str, columns={"0": "metric"})
@@ -6,9 +6,20 @@ Author: Jordan R Abrahams
 
 
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 
 
-def plot_syncvrobust(df, errorbars=True, executions=None, thresholds=None):
+DEFAULT_EXECUTIONS = ("early", "srea", "drea")
+"""Execution strategies plotted when none are given"""
+DEFAULT_THRESHOLDS = (0.0, 0.5, 1.0)
+"""Thresholds plotted for DREA-SI and DREA-AR when none are given"""
+LINESTYLES = ("-", "--", ":", "-.")
+"""Line styles cycled through for each plotted series"""
+
+
+def plot_syncvrobust(df, errorbars=True, executions=None, thresholds=None,
+                     ax=None):
     """Plot Sychronisation vs. Performance
 
     X axis: Degree of Synchronisation
@@ -26,59 +37,66 @@ def plot_syncvrobust(df, errorbars=True, executions=None, thresholds=None):
             plot. Default ["early", "srea", "drea"]
         thresholds (list, optional): List of floats of threshold values to
             plot. Default [0.0, 0.5, 1.0]
+        ax (pyplot.axes, optional): Axes to plot on. Otherwise, plot on the
+            current axes and show the plot.
     """
+    standalone = ax is None
+    if standalone:
+        ax = plt.gca()
     # Executions we care about.
     if executions is None:
-        executions = ["early", "srea", "drea"]
+        executions = DEFAULT_EXECUTIONS
     if thresholds is None:
-        thresholds = [0.0, 0.5, 1.0]
+        thresholds = DEFAULT_THRESHOLDS
     # Make use of that degree of synchrony we added in framefilters()
-    x_values = sorted(df["sync_deg"].unique().tolist())
+    # Rows without a synchrony degree are NaN there, and are never drawn.
+    x_values = np.unique(df["sync_deg"].dropna().values)
+    # Robustness mean and standard error for every execution strategy and
+    # degree of synchrony, computed in one pass over the frame.
+    sync_stats = df.groupby(["execution", "sync_deg"], observed=True)\
+        ["robustness"].agg(["mean", "sem"]) * 100
+    thresh_stats = None
     # Store y values. Is of the format {execution: list of y values}
     data_y = {}
     # Store error bars. Is of the format {execution: list of error bars}
     data_err = {}
     # Iterate through every execution strategy we care about.
     for ex in executions:
-        runs = df.loc[df["execution"] == ex]
-        for x in x_values:
-            run_deg = runs.loc[runs["sync_deg"] == x]
-            if ex != "drea-si" and ex != "drea-ar":
-                run_series = run_deg["robustness"]  # Get robustness.
-                mean = run_series.mean()
-                err = run_series.sem()  # Standard error bar.
-                if ex in data_y:
-                    data_y[ex].append(mean * 100)
-                    data_err[ex].append(err * 100)
-                else:
-                    data_y[ex] = [mean * 100]
-                    data_err[ex] = [err * 100]
-            else:
-                for t in thresholds:
-                    thresh_series = run_deg.loc[run_deg["threshold"]
-                                                == t]["robustness"]
-                    mean = thresh_series.mean()
-                    err = thresh_series.sem()
-                    label = ex + "_" + str(t)  # Make a unique label for each
-                    if label in data_y:
-                        data_y[label].append(mean * 100)
-                        data_err[label].append(err * 100)
-                    else:
-                        data_y[label] = [mean * 100]
-                        data_err[label] = [err * 100]
-    linestyles = ["-", "--", ":", "-."]
+        if ex != "drea-si" and ex != "drea-ar":
+            stats = _stats_along(sync_stats, (ex,), x_values)
+            data_y[ex] = stats["mean"].values
+            data_err[ex] = stats["sem"].values
+        else:
+            if thresh_stats is None:
+                thresh_stats = df.groupby(["execution", "threshold",
+                                           "sync_deg"], observed=True)\
+                    ["robustness"].agg(["mean", "sem"]) * 100
+            for t in thresholds:
+                stats = _stats_along(thresh_stats, (ex, t), x_values)
+                label = ex + "_" + str(t)  # Make a unique label for each
+                data_y[label] = stats["mean"].values
+                data_err[label] = stats["sem"].values
     for i, label in enumerate(data_y.keys()):
         if errorbars:
-            plt.errorbar(x_values, data_y[label], yerr=data_err[label],
-                         linewidth=1, label=label, capsize=3,
-                         linestyle=linestyles[i % len(linestyles)])
+            ax.errorbar(x_values, data_y[label], yerr=data_err[label],
+                        linewidth=1, label=label, capsize=3,
+                        linestyle=LINESTYLES[i % len(LINESTYLES)])
         else:
-            plt.plot(x_values, data_y[label], linewidth=1, label=label,
-                     linestyle=linestyles[i % len(linestyles)])
-    plt.ylim(0, 100)
-    plt.xlim(0, 25)
-    plt.legend()
-    plt.ylabel("Robustness (%)")
-    plt.xlabel("Degree of Synchronization (sec)")
-    plt.title("Degree of Synchronization vs. Performance")
-    plt.show()
+            ax.plot(x_values, data_y[label], linewidth=1, label=label,
+                    linestyle=LINESTYLES[i % len(LINESTYLES)])
+    ax.set_ylim(0, 100)
+    ax.set_xlim(0, 25)
+    ax.legend()
+    ax.set_ylabel("Robustness (%)")
+    ax.set_xlabel("Degree of Synchronization (sec)")
+    ax.set_title("Degree of Synchronization vs. Performance")
+    if standalone:
+        plt.show()
+
+
+def _stats_along(stats, key, x_values):
+    """Select the rows of grouped stats under key, one for each x value.
+        Missing rows are filled with NaN.
+    """
+    index = pd.MultiIndex.from_product([[k] for k in key] + [x_values])
+    return stats.reindex(index)
@@ -3,6 +3,7 @@
 """
 
 
+import numpy as np
 import pandas as pd
 
 
@@ -24,16 +25,15 @@ def framefilters(df, add_sync_degree=True):
         any columns we wish to add.
     """
     if add_sync_degree:
-        # Add the synchrony column, extracted from the file name.
-        sync_column = []
-        for i, row in df.iterrows():
-            foldername = row["stn_path"].split("/")[-2]
-            try:
-                synchrony = float(foldername.split("_")[4][1:]) * 0.001
-            except IndexError:
-                synchrony = "NaN"
-            sync_column.append(synchrony)
-        df = df.assign(sync_deg=pd.Series(sync_column))
+        # Add the synchrony column, extracted from the folder name. Folders
+        # without a synchrony field become NaN.
+        foldernames = df["stn_path"].str.split("/").str[-2]
+        synchrony = foldernames.str.split("_").str[4].str[1:]
+        df = df.assign(sync_deg=synchrony.astype(np.float64) * 0.001)
+    # Both columns repeat a handful of strings over many rows, so compare and
+    # group them by category codes from here on.
+    df = df.assign(stn_path=df["stn_path"].astype("category"),
+                   execution=df["execution"].astype("category"))
     # Remove zeros present in the data.
     df = clearzero(df)
     return df[df.samples >= 50]
@@ -41,23 +41,25 @@ def framefilters(df, add_sync_degree=True):
 
 def clearzero(df):
     """Remove STN rows which have 0% robustness across all runs."""
-    unique_stns = df.drop_duplicates(subset="stn_path")
-    to_remove = []
-    for _, row in unique_stns.iterrows():
-        stn_path = row["stn_path"]
-        runs = df.loc[df["stn_path"] == stn_path]
-        all_zero = True
-        for _, run in runs.iterrows():
-            if not all_zero:
-                break
-            all_zero = run["robustness"] <= 0.0
-        if all_zero:
-            to_remove.append(stn_path)
-    for path in to_remove:
-        indices = df.loc[df["stn_path"] == path]
-        common = df.merge(indices, on=['stn_path'])
-        df = df[~df.stn_path.isin(common.stn_path)]
-    return df
+    best_rob = df.groupby("stn_path", observed=True)["robustness"]\
+        .transform("max")
+    return df[best_rob > 0.0]
+
+
+def split_executions(df, executions):
+    """Split a DataFrame into one frame per execution strategy, in a single
+        pass over the "execution" column.
+
+    Args:
+        df (DataFrame): DataFrame to split.
+        executions (iterable): Names of the execution strategies to return.
+
+    Returns:
+        Returns a list of DataFrames, in the same order as executions.
+        Strategies which do not appear in df get an empty DataFrame.
+    """
+    parts = dict(tuple(df.groupby("execution", observed=True)))
+    return [parts.get(ex, df.iloc[:0]) for ex in executions]
 
 
 def threshold_means(df, thresh_name, thresholds, comp_df=None, error_fac=1.0,
@@ -158,3 +160,4 @@ def find_thresholds(df: pd.DataFrame, threshold_name: str):
     """
     thresh_series = df[threshold_name]
     return thresh_series.unique()
+
@@ -2,10 +2,15 @@
 File for writing a dictionary to
 """
 
+import csv
 import os.path
 import pandas as pd
 
 
+BUFFER_SIZE = 1 << 16
+"""Bytes of rows CSVRowWriter buffers before writing to disk"""
+
+
 def save_csv_row(row, to_file):
     """ Write dictionary to a file in CSV format.
 
@@ -31,3 +36,57 @@ def save_csv_row(row, to_file):
         # File does not exist, make it.
         df.to_csv(to_file_abs, index=False, header=True, mode='w',
                   encoding='utf-8')
+
+
+class CSVRowWriter(object):
+    """Writes dictionary rows to a CSV file which stays open between rows.
+
+    Produces the same files as save_csv_row, without reopening the file and
+    building a DataFrame for every row. The file is only opened once the first
+    row is written, so a writer which never writes leaves no file behind. The
+    columns are the keys of the first row written. A header line is written
+    first if the file is new or empty.
+
+    Use as a context manager, or call close() when finished.
+
+    Args:
+        to_file (str): File path to write to.
+    """
+
+    def __init__(self, to_file):
+        self._path = os.path.abspath(os.path.expanduser(to_file))
+        self._file = None
+        self._writer = None
+
+    def write_row(self, row):
+        """Write a single row.
+
+        Args:
+            row (dict): Row to write. Keys are the columns.
+        """
+        if self._writer is None:
+            self._file = open(self._path, "a", newline="", encoding="utf-8",
+                              buffering=BUFFER_SIZE)
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row),
+                                          lineterminator="\n")
+            # Appending starts at the end, so this is only 0 for an empty
+            # file, which still needs its header.
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+        self._writer.writerow(row)
+
+    def flush(self):
+        """Push buffered rows out to the file."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -21,7 +21,7 @@ import pandas as pd
 import numpy as np
 
 
-from libheat.plotting.plot_utils import framefilters
+from libheat.plotting.plot_utils import framefilters, split_executions
 from libheat.plotting.plot_arsc import plot_arsc_cross
 from libheat.plotting.plot_ara import plot_ara
 from libheat.plotting.plot_syncvrobust import plot_syncvrobust
@@ -35,6 +35,22 @@ CM2INCH = 0.393701
 # Default sizes in centimetres.
 DEFAULT_WIDTH = 12
 DEFAULT_HEIGHT = 6
+# Thresholds the DREA-AR/SI clinic runs were simulated at.
+THRESHOLDS = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+# Finer grid of thresholds used by the later DREAM runs.
+FINE_THRESHOLDS = np.array([0.0, 0.0625, 0.125, 0.25, 0.375, 0.5, 0.75, 1.0])
+# Columns read from the result CSVs. Anything else the simulator writes is
+# never plotted, so we don't bother parsing it.
+USECOLS = ("stn_path", "execution", "robustness", "samples", "threshold",
+           "ar_threshold", "si_threshold", "sc_threshold", "reschedule_freq",
+           "send_freq", "runtime", "sd_avg")
+# Explicit types for the columns above, so pandas doesn't need to infer them.
+DTYPES = {"stn_path": "category", "execution": "category",
+          "robustness": np.float64, "samples": np.int32,
+          "threshold": np.float64, "ar_threshold": np.float64,
+          "si_threshold": np.float64, "sc_threshold": np.float64,
+          "reschedule_freq": np.float64, "send_freq": np.float64,
+          "runtime": np.float64, "sd_avg": np.float64}
 
 
 def main():
@@ -42,14 +58,9 @@ def main():
     rcParams["font.family"] = "serif"
 
     args = parse_args()
-    full_df = None
     files = flatten_files(args.file)
-    for f in files:
-        if full_df is None:
-            full_df = pd.read_csv(f, header=0)
-        else:
-            df = pd.read_csv(f, header=0)
-            full_df = full_df.append(df, ignore_index=True, sort=True)
+    frames = [read_results(f) for f in files]
+    full_df = pd.concat(frames, ignore_index=True, sort=True)
 
     # Filter the samples
     full_df = framefilters(full_df)
@@ -61,9 +72,9 @@ def main():
     print(full_df["stn_path"].nunique())
 
     if args.syncvrobust:
-        plot_syncvrobust(full_df, errorbars=True)
+        plot_syncvrobust(full_df, errorbars=True, ax=ax)
     elif args.reschedules:
-        plot_threshold(full_df, "si")
+        plot_threshold(full_df, "si", ax=ax)
     elif args.dream_cross_section:
         # Plot a cross section of the DREAM data.
         #ax.set_title("DREAM Threshold SC Analysis (m_AR = 1)")
@@ -102,6 +113,16 @@ def main():
         plt.savefig(args.output)
 
 
+def read_results(path):
+    """Read a simulation results CSV, keeping only the columns we plot.
+
+    Older result files lack some of the threshold columns, so missing columns
+    are skipped rather than treated as an error.
+    """
+    return pd.read_csv(path, header=0, usecols=lambda c: c in USECOLS,
+                       dtype=DTYPES)
+
+
 def flatten_files(files):
     """Check all files in the provided list. If a directory, recurse on
         on those files.
@@ -109,17 +130,20 @@ def flatten_files(files):
     if not isinstance(files, list):
         raise TypeError("files is instance of {}, not of type list"
                 .format(type(files)))
-    if len(files) == 0:
-        return []
-    else:
-        if os.path.isdir(files[0]):
-            subchildren = [ files[0] + "/" + i for i in os.listdir(files[0])]
-            return flatten_files(subchildren) + flatten_files(files[1:])
+    flat = []
+    # Walk depth first, in listing order.
+    pending = files[::-1]
+    while pending:
+        path = pending.pop()
+        if os.path.isdir(path):
+            with os.scandir(path) as contents:
+                pending.extend(reversed([entry.path for entry in contents]))
         else:
-            return [files[0]] + flatten_files(files[1:])
+            flat.append(path)
+    return flat
 
 
-def sd_v_robust(df):
+def sd_v_robust(df, ax=None):
     """Plot Standard Deviation of Contingent Edges vs. Performance
         Produces a scatterplot.
 
@@ -129,191 +153,188 @@ def sd_v_robust(df):
     Args:
         df (DataFrame): DataFrame of results to be passed. Must have a
             "sd_avg" column.
+        ax (pyplot.axes, optional): Axes to plot on. Otherwise, plot on the
+            current axes and show the plot.
     """
-    early = df.loc[df['execution'] == "early"]
-    srea = df.loc[df['execution'] == "srea"]
-    drea = df.loc[df['execution'] == "drea"]
+    standalone = ax is None
+    if standalone:
+        ax = plt.gca()
+    early, srea, drea = split_executions(df, ("early", "srea", "drea"))
 
     early_rob = early["robustness"]
     srea_rob = srea["robustness"]
     drea_rob = drea["robustness"]
 
-    plt.scatter(early["sd_avg"].tolist(), early_rob.tolist(),
-                alpha=0.2,
-                label="Early")
-    plt.scatter(srea["sd_avg"].tolist(), srea_rob.tolist(),
-                alpha=0.2,
-                label="SREA")
-    plt.scatter(drea["sd_avg"].tolist(), drea_rob.tolist(),
-                alpha=0.2,
-                label="DREA")
-    plt.legend()
-    plt.ylabel("Robustness")
-    plt.xlabel("Standard Deviation of Contingent Edges")
-    plt.title("Edge Standard Deviation vs. Performance")
-    plt.show()
-
-
-def plot_threshold(df, alg):
+    # Every row is drawn. Rasterizing keeps large scatters cheap to render
+    # and save.
+    ax.scatter(early["sd_avg"].values, early_rob.values,
+               alpha=0.2,
+               label="Early",
+               rasterized=True)
+    ax.scatter(srea["sd_avg"].values, srea_rob.values,
+               alpha=0.2,
+               label="SREA",
+               rasterized=True)
+    ax.scatter(drea["sd_avg"].values, drea_rob.values,
+               alpha=0.2,
+               label="DREA",
+               rasterized=True)
+    ax.legend()
+    ax.set_ylabel("Robustness")
+    ax.set_xlabel("Standard Deviation of Contingent Edges")
+    ax.set_title("Edge Standard Deviation vs. Performance")
+    if standalone:
+        plt.show()
+
+
+def plot_threshold(df, alg, ax=None):
     """ Plot SI thresholds when compared against DREA.
 
     Args:
         df (DataFrame):
         alg (str): Algorithm to analyse using the threshold.
+        ax (pyplot.axes, optional): Axes to plot on. Otherwise, plot on the
+            current axes and show the plot.
     """
+    standalone = ax is None
+    if standalone:
+        ax = plt.gca()
 
-    srea = df.loc[df['execution'] == "srea"]
-    drea = df.loc[df['execution'] == "drea"]
-    drea_si = df.loc[df['execution'] == "drea-si"]
-    drea_ar = df.loc[df['execution'] == "drea-ar"]
-    early = df.loc[df['execution'] == 'early']
+    srea, drea, drea_si, drea_ar = split_executions(
+        df, ("srea", "drea", "drea-si", "drea-ar"))
 
-    srea_rob = srea["robustness"]
-    early_rob = early["robustness"]
     drea_rob = drea["robustness"]
-    drea_si_rob = drea_si["robustness"]
-    drea_ar_rob = drea_ar["robustness"]
 
-    thresholds = [0.0, 0.0625, 0.125, 0.25, 0.375, 0.5, 0.75, 1.0]
+    thresholds = FINE_THRESHOLDS
+    drea_mean = drea_rob.mean()
     drea_res = drea["reschedule_freq"].mean()
     drea_send = drea["send_freq"].mean()
     drea_run = drea["runtime"].mean()
 
     if "si" in alg.split():
-        rob_means = []
-        rob_sd = []
-        sends = []
-        runs = []
-        for i in thresholds:
-            i_drea_si = drea_si.loc[drea_si["si_threshold"] == i]
-            rob_means.append(i_drea_si["robustness"].mean()/drea_rob.mean()
-                             *100)
-            rob_sd.append(i_drea_si["robustness"].sem()*100)
-            sends.append((i_drea_si["send_freq"].mean()/drea_send)*100)
-            runs.append((i_drea_si["runtime"].mean()/drea_run)*100)
-        plt.errorbar(thresholds, rob_means, yerr=rob_sd, linestyle='-',
-                     capsize=4, linewidth=1,
-                     label="SI Robustness")
-        plt.plot(thresholds, sends, linestyle='-.', linewidth=1,
-                 label="SI Sent Schedules")
-        plt.plot(thresholds, runs, linestyle=':', linewidth=1,
-                 label="SI Runtime")
+        by_thresh = drea_si.groupby("si_threshold")
+        means = (by_thresh[["robustness", "send_freq", "runtime"]].mean()
+                 .reindex(thresholds))
+        rob_means = means["robustness"]/drea_mean*100
+        rob_sd = by_thresh["robustness"].sem().reindex(thresholds)*100
+        sends = (means["send_freq"]/drea_send)*100
+        runs = (means["runtime"]/drea_run)*100
+        ax.errorbar(thresholds, rob_means, yerr=rob_sd, linestyle='-',
+                    capsize=4, linewidth=1,
+                    label="SI Robustness")
+        ax.plot(thresholds, sends, linestyle='-.', linewidth=1,
+                label="SI Sent Schedules")
+        ax.plot(thresholds, runs, linestyle=':', linewidth=1,
+                label="SI Runtime")
     if "ar" in alg.split():
-        rob_means = []
-        rob_sd = []
-        res = []
-        runs = []
-        for i in thresholds:
-            i_drea_ar = drea_ar.loc[drea_ar["ar_threshold"] == i]
-            rob_means.append(i_drea_ar["robustness"].mean()/drea_rob.mean()
-                             *100)
-            rob_sd.append(i_drea_ar["robustness"].sem()*100)
-            res.append((i_drea_ar["reschedule_freq"].mean()/drea_res)*100)
-            runs.append((i_drea_ar["runtime"].mean()/drea_run)*100)
-        plt.errorbar(thresholds, rob_means, yerr=rob_sd, linestyle='-',
-                     capsize=4, linewidth=1,
-                     label="AR Robustness")
-        plt.plot(thresholds, res, linestyle='-.', linewidth=1,
-                 label="AR Reschedules")
-        plt.plot(thresholds, runs, linestyle=':', linewidth=1,
-                 label="AR Runtime")
-
-    plt.plot([0.0, 1.0], [srea["robustness"].mean()/drea_rob.mean()*100]*2,
-             linewidth=1, dashes=[4, 6, 2, 6],
-             color="m",
-             label="SREA Robustness")
-
-    plt.ylim(0,120)
-    plt.xlim(0, 1)
-    plt.legend(loc="lower center")
-    plt.xlabel("Threshold of Algorithm")
-    plt.ylabel("Percent of DREA")
-    plt.title("Trade-offs Between Communication and Performance")
-    plt.show()
-
-
-def clinic_ar_threshold(df):
-    srea = df.loc[df['execution'] == "srea"]
-    drea = df.loc[df['execution'] == "drea"]
-    drea_ar = df.loc[df['execution'] == "drea-ar"]
-    early = df.loc[df['execution'] == 'early']
+        by_thresh = drea_ar.groupby("ar_threshold")
+        means = (by_thresh[["robustness", "reschedule_freq", "runtime"]]
+                 .mean().reindex(thresholds))
+        rob_means = means["robustness"]/drea_mean*100
+        rob_sd = by_thresh["robustness"].sem().reindex(thresholds)*100
+        res = (means["reschedule_freq"]/drea_res)*100
+        runs = (means["runtime"]/drea_run)*100
+        ax.errorbar(thresholds, rob_means, yerr=rob_sd, linestyle='-',
+                    capsize=4, linewidth=1,
+                    label="AR Robustness")
+        ax.plot(thresholds, res, linestyle='-.', linewidth=1,
+                label="AR Reschedules")
+        ax.plot(thresholds, runs, linestyle=':', linewidth=1,
+                label="AR Runtime")
+
+    ax.axhline(srea["robustness"].mean()/drea_mean*100,
+               linewidth=1, dashes=[4, 6, 2, 6],
+               color="m",
+               label="SREA Robustness")
+
+    ax.set_ylim(0,120)
+    ax.set_xlim(0, 1)
+    ax.legend(loc="lower center")
+    ax.set_xlabel("Threshold of Algorithm")
+    ax.set_ylabel("Percent of DREA")
+    ax.set_title("Trade-offs Between Communication and Performance")
+    if standalone:
+        plt.show()
+
+
+def clinic_ar_threshold(df, ax=None):
+    """Plot the reduction from DREA of DREA-AR over AR thresholds.
+
+    Args:
+        df (DataFrame): DataFrame of results to be passed.
+        ax (pyplot.axes, optional): Axes to plot on. Otherwise, plot on the
+            current axes and show the plot.
+    """
+    standalone = ax is None
+    if standalone:
+        ax = plt.gca()
+
+    drea, drea_ar = split_executions(df, ("drea", "drea-ar"))
 
-    srea_rob = srea["robustness"]
-    early_rob = early["robustness"]
     drea_rob = drea["robustness"]
-    drea_ar_rob = drea_ar["robustness"]
 
-    thresholds = [0.0, 0.25, 0.5, 0.75, 1.0]
-    drea_p = sum(drea["samples"]*drea["robustness"]) / sum(drea["samples"])
+    thresholds = THRESHOLDS
     drea_res = drea["reschedule_freq"].mean()
     drea_run = drea["runtime"].mean()
 
     # AR
-    rob_means = []
-    rob_e = []
-    res = []
-    res_e = []
-    runs = []
-    runs_e = []
-    for i in thresholds:
-        i_drea_ar = drea_ar.loc[drea_ar["threshold"] == i]
-        n = sum(i_drea_ar["samples"])
-        p = sum(i_drea_ar["samples"] * i_drea_ar["robustness"])\
-                / n
-        sem = ((p*(1-p)/n)**0.5)*100
-        rob_means.append((1-i_drea_ar["robustness"].mean()/drea_rob.mean())
-                         *100)
-        #rob_means.append((1 - p/drea_p)*100)
-        rob_e.append(i_drea_ar["robustness"].sem()*100)
-        res.append((1 - i_drea_ar["reschedule_freq"].mean()/drea_res)*100)
-        res_e.append(i_drea_ar["reschedule_freq"].sem()*100)
-        runs.append((1 - i_drea_ar["runtime"].mean()/drea_run)*100)
-        runs_e.append(i_drea_ar["runtime"].sem()*100)
-
-    plt.errorbar(thresholds, rob_means, yerr=rob_e, linestyle='-', capsize=3,
-                 linewidth=1, label="Empirical Success Rate (%)")
-    plt.plot(thresholds, res, linestyle='-.', linewidth=1,
-             label="Number of Reschedules")
-    plt.plot(thresholds, runs, linestyle=':', linewidth=1, label="Runtime")
-
-    plt.ylim(-40, 100)
-    plt.xlim(0, 1)
-    plt.legend(loc="lower center")
-    plt.xlabel("Allowable Risk Threshold")
-    plt.ylabel("Percent Reduction from DREA")
-    plt.title("Trade-offs Between Communication and Performance in AR")
-    plt.show()
-
-
-def plot_reschedule(df, plot_type="box"):
-    drea = df.loc[df['execution'] == "drea"]
-    drea_alp = df.loc[df['execution'] == "drea-alp"]
-    drea_si = df.loc[df['execution'] == "drea-si"]
-    drea_ar = df.loc[df['execution'] == "drea-ar"]
-
-    ax = plt.axes()
-
-    x_d = np.arange(0.0, 1.1, 0.1)
+    by_thresh = drea_ar.groupby("threshold")
+    columns = ["robustness", "reschedule_freq", "runtime"]
+    means = by_thresh[columns].mean().reindex(thresholds)
+
+    rob_means = (1 - means["robustness"]/drea_rob.mean())*100
+    rob_e = by_thresh["robustness"].sem().reindex(thresholds)*100
+    res = (1 - means["reschedule_freq"]/drea_res)*100
+    runs = (1 - means["runtime"]/drea_run)*100
+
+    ax.errorbar(thresholds, rob_means, yerr=rob_e, linestyle='-', capsize=3,
+                linewidth=1, label="Empirical Success Rate (%)")
+    ax.plot(thresholds, res, linestyle='-.', linewidth=1,
+            label="Number of Reschedules")
+    ax.plot(thresholds, runs, linestyle=':', linewidth=1, label="Runtime")
+
+    ax.set_ylim(-40, 100)
+    ax.set_xlim(0, 1)
+    ax.legend(loc="lower center")
+    ax.set_xlabel("Allowable Risk Threshold")
+    ax.set_ylabel("Percent Reduction from DREA")
+    ax.set_title("Trade-offs Between Communication and Performance in AR")
+    if standalone:
+        plt.show()
+
+
+def plot_reschedule(df, plot_type="box", ax=None):
+    """Box plot the reschedules of DREA-SI, DREA-ALP and DREA-AR over
+        thresholds, against the median of DREA.
+
+    Args:
+        df (DataFrame): DataFrame of results to be passed.
+        plot_type (str, optional): Unused. Default is "box".
+        ax (pyplot.axes, optional): Axes to plot on. Otherwise, plot on the
+            current axes and show the plot.
+    """
+    drea, drea_alp, drea_si, drea_ar = split_executions(
+        df, ("drea", "drea-alp", "drea-si", "drea-ar"))
+
+    standalone = ax is None
+    if standalone:
+        ax = plt.gca()
+
     res = drea["reschedule_freq"].median()
-    y_d = [res]*len(x_d)
-    ax.plot(x_d, y_d, "k--")
+    ax.axhline(res, color="k", linestyle="--")
 
-    thresholds = (0.0, 0.25, 0.5, 0.75, 1.0)
+    thresholds = THRESHOLDS
     # boxplot offsets
     plot_off = 0.035
 
-    y_si = []
-    y_alp = []
-    for i, j in enumerate(thresholds):
-        y_si = (drea_si.loc[drea_si["threshold"] == j]["reschedule_freq"]
-                .tolist())
-        y_si = [i for i in y_si if i > 0.0]
-        y_alp = (drea_alp.loc[drea_alp["threshold"] == j]["reschedule_freq"]
-                 .tolist())
-        y_alp = [i for i in y_alp if i > 0.0]
-        y_ar = (drea_ar.loc[drea_alp["threshold"] == j]["reschedule_freq"]
-                .tolist())
-        y_ar = [i for i in y_ar if i > 0.0]
+    si_res = _reschedules_by_threshold(drea_si)
+    alp_res = _reschedules_by_threshold(drea_alp)
+    ar_res = _reschedules_by_threshold(drea_ar)
+    no_res = np.array([])
+    for j in thresholds:
+        y_si = si_res.get(j, no_res)
+        y_alp = alp_res.get(j, no_res)
+        y_ar = ar_res.get(j, no_res)
 
         bp = ax.boxplot([y_si, y_alp, y_ar], positions=(j-plot_off, j,
                                                         j+plot_off),
@@ -326,7 +347,33 @@ def plot_reschedule(df, plot_type="box"):
     ax.set_xticks(thresholds)
     ax.set_xticklabels(thresholds)
 
-    plt.show()
+    if standalone:
+        plt.show()
+
+
+def _reschedules_by_threshold(df):
+    """Group the positive reschedule frequencies of df by its threshold.
+
+    Returns:
+        Returns a dictionary of {threshold: array of reschedule frequencies}.
+    """
+    resched = df.loc[df["reschedule_freq"] > 0.0]
+    return {t: group.values
+            for t, group in resched.groupby("threshold")["reschedule_freq"]}
+
+
+def color_boxes(bp):
+    """Colour the three boxes of a boxplot red, blue and green, in order.
+
+    Args:
+        bp (dict): Dictionary of artists returned by boxplot, which must hold
+            exactly three boxes.
+    """
+    colors = ["red", "blue", "green"]
+    for i, c in enumerate(colors):
+        plt.setp([bp["boxes"][i], bp["medians"][i],
+                  bp["caps"][2*i], bp["caps"][2*i + 1],
+                  bp["whiskers"][2*i], bp["whiskers"][2*i + 1]], color=c)
 
 
 def parse_args():
@@ -15,17 +15,16 @@ simulation runs to take place.
 """
 
 import sys
-
-try:
-    assert (sys.version_info >= (3, 0))
-except AssertionError:
-    print("Simulations must be run with Python3 or a later version.")
-
 import os
 import os.path
 import time
 import multiprocessing
 import argparse
+import atexit
+import functools
+import signal
+from collections import Counter, namedtuple
+from contextlib import ExitStack
 import numpy as np
 
 
@@ -41,6 +40,25 @@ MAX_SEED = 2 ** 31 - 1
 """The maximum number a random seed can be."""
 DEFAULT_DECOUPLE = "srea"
 """The default decoupling type for DecoupledSimulator"""
+POOL_START_METHOD = "spawn" if sys.platform == "win32" else "fork"
+"""How worker processes are started. Forked workers inherit the parent's
+memory, so they start without re-importing this module and its dependencies.
+"""
+POOL_RETRIES = 3
+"""How many times to retry starting a worker pool if the system runs out of
+processes."""
+
+
+class StageResult(namedtuple("StageResult", [
+        "execution", "robustness", "threads", "random_seed", "runtime",
+        "samples", "timestamp", "stn_path", "stn_name", "ar_threshold",
+        "si_threshold", "synchronous_density", "sd_avg", "vert_count",
+        "agents", "mean_verts_agent", "max_verts_agent", "contingent_density",
+        "reschedule_freq", "send_freq"])):
+    """The results of one stage of simulations on a single STN. Fields are
+        in the order of the output CSV columns.
+    """
+    __slots__ = ()
 
 
 def main():
@@ -56,6 +74,12 @@ def main():
         pr.set_verbosity(1)
         pr.verbose("Verbosity set to: 1")
 
+    if args.timer_out is not None:
+        # Saved on exit, including when the run is stopped with SIGTERM.
+        atexit.register(functiontimer.save_times, args.timer_out)
+        signal.signal(signal.SIGTERM,
+                      functools.partial(_exit_on_sigterm, os.getpid()))
+
     sim_count = args.samples
 
     sim_options = {"ar_threshold": args.ar_threshold,
@@ -84,6 +108,18 @@ def main():
                  ordering_pairs=ordering_pairs)
 
 
+def _exit_on_sigterm(main_pid, signum, frame):
+    """Signal handler which turns SIGTERM into a normal exit in the main
+        process, so that atexit functions still run. Worker processes
+        inherit the handler, and are killed as usual.
+    """
+    if os.getpid() != main_pid:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+        return
+    sys.exit(128 + signum)
+
+
 def across_paths(stn_paths, execution, threads, sim_count, sim_options,
                  output=None, live_updates=True, random_seed=None,
                  mitparse=False, start_index=0, stop_index=None,
@@ -101,142 +137,227 @@ def across_paths(stn_paths, execution, threads, sim_count, sim_options,
         random_seed (int, optional): The random seed to start out with,
             defaults to a random... random seed.
         mitparse (boolean, optional): Parse STN JSON files as MIT format.
-        ordering_pairs (list, optional): List of tuples of AR and SC settings.
-            Each STN will be run with a separate simulation for each tuple.
+        ordering_pairs (ndarray, optional): (N, 2) array of AR and SC
+            settings, as returned by parseindefinite.parse_ind_arg, or a list
+            of (AR, SC) tuples. Each STN will be run with a separate
+            simulation for each pair.
     """
-    stn_pairs = []
     # Collect the STNs from all the passed in paths
     # Make sure we keep the path around though, and keep them in the pair.
-    for i, path in enumerate(stn_paths):
-        if mitparse:
+    if mitparse:
+        # MIT files can hold several STNs, so they must all be parsed up
+        # front to know how many there are.
+        stn_pairs = []
+        for path in stn_paths:
             mitstns = mitparser.mit2stn(path, add_z=True, connect_origin=True)
             stn_pairs += [(path, k) for k in mitstns]
+        pair_count = len(stn_pairs)
+        stn_pairs = stn_pairs[start_index:stop_index]
+    else:
+        # One STN per file, so each is only loaded once the simulation loop
+        # gets to it. Files outside of the start and stop points are never
+        # loaded at all.
+        stn_paths = list(stn_paths)
+        pair_count = len(stn_paths)
+        stn_pairs = _iter_json_pairs(stn_paths[start_index:stop_index])
+
+    with ExitStack() as stack:
+        if output is not None:
+            writer = stack.enter_context(sim2csv.CSVRowWriter(output))
         else:
-            stn = load_stn_from_json_file(path)["stn"]
-            stn_pairs.append((path, stn))
+            writer = None
+        # One pool of workers serves every stage, rather than starting new
+        # processes for each one.
+        if threads > 1:
+            pool = stack.enter_context(_make_pool(threads))
+        else:
+            pool = None
+        _simulate_pairs(stn_pairs, pair_count, execution, threads, sim_count,
+                        sim_options, writer, pool, live_updates, random_seed,
+                        start_index, ordering_pairs)
+
 
+def _iter_json_pairs(stn_paths):
+    """Yield a (path, STN) pair for each JSON STN file, loading each file
+        only when it is asked for.
+    """
+    for path in stn_paths:
+        yield (path, load_stn_from_json_file(path)["stn"])
+
+
+def _simulate_pairs(stn_pairs, pair_count, execution, threads, sim_count,
+                    sim_options, writer, pool, live_updates, random_seed,
+                    start_index, ordering_pairs):
+    """Run the simulations for each (path, STN) pair, as set up by
+        across_paths. Results are written to writer unless it is None.
+        pair_count is the total number of pairs, for progress updates, and
+        start_index is the index of the first pair in stn_pairs. pool is the
+        worker pool to simulate with, or None for a single thread.
+    """
+    if ordering_pairs is not None:
+        # Accept a list of (AR, SC) tuples as well as an array.
+        ordering_pairs = np.asarray(ordering_pairs,
+                                    dtype=np.float64).reshape(-1, 2)
+        n_settings = len(ordering_pairs)
+        ar_thresholds = ordering_pairs[:, 0].tolist()
+        sc_thresholds = ordering_pairs[:, 1].tolist()
+        # Stages run one at a time, so a single options dict can be updated
+        # in place for each setting.
+        sim_option_instance = sim_options.copy()
     # We must separate these for loops because MIT stns can hold several
     # instances in a single file.
-    for i, pair in enumerate(stn_pairs):
-        if i < start_index:
-            continue
-        if stop_index is not None:
-            if i >= stop_index:
-                break
+    for i, pair in enumerate(stn_pairs, start_index):
+        # These only depend on the STN, so share them between stages.
+        stn_stats = _compute_stn_stats(pair[1])
         if ordering_pairs is not None:
-            for j, execution_setting in enumerate(ordering_pairs):
-                sim_option_instance = sim_options.copy()
-                sim_option_instance["ar_threshold"] = execution_setting[0]
-                sim_option_instance["si_threshold"] = execution_setting[1]
-                results_dict = _run_stage(pair, execution, sim_count, threads,
-                                      random_seed, sim_option_instance)
+            for j, (ar, sc) in enumerate(zip(ar_thresholds, sc_thresholds)):
+                sim_option_instance["ar_threshold"] = ar
+                sim_option_instance["si_threshold"] = sc
+                result = _run_stage(pair, execution, sim_count, threads,
+                                    random_seed, sim_option_instance,
+                                    stn_stats, pool)
                 if live_updates:
-                    _print_results(results_dict,
-                                   j + len(ordering_pairs)*i + 1,
-                                   len(stn_pairs)*len(ordering_pairs))
-                
-                if output is not None:
-                    sim2csv.save_csv_row(results_dict, output)
-    
-        
+                    _print_results(result,
+                                   j + n_settings*i + 1,
+                                   pair_count*n_settings)
+
+                if writer is not None:
+                    writer.write_row(result._asdict())
         else:
-            results_dict = _run_stage(pair, execution, sim_count, threads,
-                                      random_seed, sim_options)
+            result = _run_stage(pair, execution, sim_count, threads,
+                                random_seed, sim_options, stn_stats, pool)
             if live_updates:
-                _print_results(results_dict, i + 1, len(stn_pairs))
-            
-            if output is not None:
-                sim2csv.save_csv_row(results_dict, output)
+                _print_results(result, i + 1, pair_count)
+
+            if writer is not None:
+                writer.write_row(result._asdict())
+        # Get this STN's rows onto disk before starting on the next one.
+        if writer is not None:
+            writer.flush()
 
 
-def _run_stage(pair, execution, sim_count, threads, random_seed, sim_options):
-    """Run a single stage of the multiple simulation set up."""
+def _run_stage(pair, execution, sim_count, threads, random_seed, sim_options,
+               stn_stats=None, pool=None):
+    """Run a single stage of the multiple simulation set up.
+
+    Args:
+        stn_stats (dict, optional): Statistics of the STN, as returned by
+            _compute_stn_stats. Computed here if not given.
+        pool (Pool, optional): Worker pool to pass on to multiple_simulations.
+
+    Returns:
+        A StageResult of the stage.
+    """
 
     path, stn = pair
+    if stn_stats is None:
+        stn_stats = _compute_stn_stats(stn)
     
     start_time = time.time()
     response_dict = multiple_simulations(stn, execution, sim_count,
                                          threads=threads,
                                          random_seed=random_seed,
-                                         sim_options=sim_options)
+                                         sim_options=sim_options,
+                                         pool=pool)
     runtime = time.time() - start_time
 
     results = response_dict["sample_results"]
     reschedules = response_dict["reschedules"]
     sent_schedules = response_dict["sent_schedules"]
 
-    robustness = results.count(True)/len(results)
-    vert_count = len(stn.verts)
-    max_verts_on_agent = max_agent_verts(stn)
-    mean_verts_on_agent = (len(stn.verts) - 1)/len(stn.agents)
-    cont_dens = len(stn.contingent_edges)/len(stn.edges)
-    synchrony = len(stn.interagent_edges)/len(stn.edges)
+    robustness = _list_mean(results, bool)
 
-    total_sd = 0
-    for e in stn.contingent_edges.values():
-        try:
-            total_sd += e.sigma
-        except ValueError:
-            continue
-    sd_avg = total_sd / len(stn.contingent_edges)
-
-    results_dict = {}
-    results_dict["execution"] = execution
-    results_dict["robustness"] = robustness
-    results_dict["threads"] = threads
-    results_dict["random_seed"] = random_seed
-    results_dict["runtime"] = runtime
-    results_dict["samples"] = sim_count
-    results_dict["timestamp"] = time.time()
-    results_dict["stn_path"] = path
-    results_dict["stn_name"] = stn.name
-    results_dict["ar_threshold"] = sim_options["ar_threshold"]
-    results_dict["si_threshold"] = sim_options["si_threshold"]
-    results_dict["synchronous_density"] = synchrony
-    results_dict["sd_avg"] = sd_avg
-    results_dict["vert_count"] = vert_count
-    results_dict["agents"] = len(stn.agents)
-    results_dict["mean_verts_agent"] = mean_verts_on_agent
-    results_dict["max_verts_agent"] = max_verts_on_agent
-    results_dict["contingent_density"] = cont_dens
-    results_dict["reschedule_freq"] = sum(reschedules)/len(reschedules)
-    results_dict["send_freq"] = sum(sent_schedules)/len(sent_schedules)
-
-    return results_dict
-
-
-
-def _print_results(results_dict, i, stn_count):
+    return StageResult(execution=execution,
+                       robustness=robustness,
+                       threads=threads,
+                       random_seed=random_seed,
+                       runtime=runtime,
+                       samples=sim_count,
+                       timestamp=time.time(),
+                       stn_path=path,
+                       stn_name=stn.name,
+                       ar_threshold=sim_options["ar_threshold"],
+                       si_threshold=sim_options["si_threshold"],
+                       reschedule_freq=_list_mean(reschedules, np.int64),
+                       send_freq=_list_mean(sent_schedules, np.int64),
+                       **stn_stats)
+
+
+def _list_mean(values, dtype):
+    """Returns the mean of a list of values of the given dtype as a float."""
+    return float(np.fromiter(values, dtype=dtype, count=len(values)).mean())
+
+
+def _compute_stn_stats(stn):
+    """Compute the statistics of an STN which are reported with each stage.
+
+    Returns:
+        A dictionary with the keys "vert_count", "agents", "mean_verts_agent",
+        "max_verts_agent", "contingent_density", "synchronous_density" and
+        "sd_avg".
+    """
+    # Only normally distributed edges have a sigma; the rest add nothing to
+    # the total, but still count towards the average.
+    sigmas = (_normal_sigma(e) for e in stn.contingent_edges.values())
+    total_sd = np.fromiter((sd for sd in sigmas if sd is not None),
+                           dtype=np.float64).sum()
+
+    stn_stats = {}
+    stn_stats["vert_count"] = len(stn.verts)
+    stn_stats["agents"] = len(stn.agents)
+    stn_stats["mean_verts_agent"] = (len(stn.verts) - 1)/len(stn.agents)
+    stn_stats["max_verts_agent"] = max_agent_verts(stn)
+    stn_stats["contingent_density"] = len(stn.contingent_edges)/len(stn.edges)
+    stn_stats["synchronous_density"] = (len(stn.interagent_edges)
+                                        / len(stn.edges))
+    stn_stats["sd_avg"] = float(total_sd) / len(stn.contingent_edges)
+    return stn_stats
+
+
+def _normal_sigma(edge):
+    """Returns the sigma of a contingent edge, or None if the edge is not
+        normally distributed.
+    """
+    try:
+        return edge.sigma
+    except ValueError:
+        return None
+
+
+def _print_results(result, i, stn_count):
     """Pretty print the results of N samples of simulation"""
-    print("-"*79)
-    print("    Ran on: {}".format(results_dict["stn_path"]))
-    print("    Name: {}".format(results_dict["stn_name"]))
-    print("    Timestamp: {}".format(results_dict["timestamp"]))
-    print("    Samples: {}".format(results_dict["samples"]))
-    print("    Threads: {}".format(results_dict["threads"]))
-    print("    Execution: {}".format(results_dict["execution"]))
-    print("    AR Threshold: {}".format(results_dict["ar_threshold"]))
-    print("    SI Threshold: {}".format(results_dict["si_threshold"]))
-    print("    Robustness: {}".format(results_dict["robustness"]))
-    print("    Seed: {}".format(results_dict["random_seed"]))
-    print("    Runtime: {}".format(results_dict["runtime"]))
-    print("    Vert Count: {}".format(results_dict["vert_count"]))
-    print("    Agents: {}".format(results_dict["agents"]))
-    print("    Max verts on Agent: {}".format(results_dict["max_verts_agent"]))
-    print("    Mean verts on Agent: {}".format(
-        results_dict["mean_verts_agent"]))
-    print("    Cont Edge Dens: {}".format(results_dict["contingent_density"]))
-    print("    Cont SD Avg: {}".format(results_dict["sd_avg"]))
-    print("    Sync Density: {}".format(results_dict["synchronous_density"]))
-    print("    Resc Freq: {}".format(results_dict["reschedule_freq"]))
-    print("    Send Freq: {}".format(results_dict["send_freq"]))
-    print("    Total Progress: {}/{}".format(i, stn_count))
-    print("-"*79)
+    # Written out in one go, rather than a line at a time.
+    lines = [
+        "-"*79,
+        "    Ran on: {}".format(result.stn_path),
+        "    Name: {}".format(result.stn_name),
+        "    Timestamp: {}".format(result.timestamp),
+        "    Samples: {}".format(result.samples),
+        "    Threads: {}".format(result.threads),
+        "    Execution: {}".format(result.execution),
+        "    AR Threshold: {}".format(result.ar_threshold),
+        "    SI Threshold: {}".format(result.si_threshold),
+        "    Robustness: {}".format(result.robustness),
+        "    Seed: {}".format(result.random_seed),
+        "    Runtime: {}".format(result.runtime),
+        "    Vert Count: {}".format(result.vert_count),
+        "    Agents: {}".format(result.agents),
+        "    Max verts on Agent: {}".format(result.max_verts_agent),
+        "    Mean verts on Agent: {}".format(result.mean_verts_agent),
+        "    Cont Edge Dens: {}".format(result.contingent_density),
+        "    Cont SD Avg: {}".format(result.sd_avg),
+        "    Sync Density: {}".format(result.synchronous_density),
+        "    Resc Freq: {}".format(result.reschedule_freq),
+        "    Send Freq: {}".format(result.send_freq),
+        "    Total Progress: {}/{}".format(i, stn_count),
+        "-"*79,
+    ]
+    print("\n".join(lines))
 
 
 def multiple_simulations(starting_stn, execution_strat,
                          count, threads=1, random_seed=None,
-                         sim_options={}):
+                         sim_options={}, pool=None):
     """Run multiple simulations on a single STN.
 
     Args:
@@ -248,6 +369,9 @@ def multiple_simulations(starting_stn, execution_strat,
             seeds from this instance. None indicates a random random-seed.
         sim_options (dict): A set of options (usually thresholds) for the
             simulator.
+        pool (Pool, optional): Worker pool to run the simulations on when
+            threads is more than 1, so several calls can share one pool.
+            By default a pool is started for this call only.
 
     Returns:
         A response dictionary with three entries in it.
@@ -262,86 +386,95 @@ def multiple_simulations(starting_stn, execution_strat,
     # Each thread needs its own simulator, otherwise the progress of one thread
     # can overwrite the progress of another
     print("Random seed is: {}".format(random_seed))
-    if random_seed is not None:
-        seed_gen = np.random.RandomState(random_seed)
-        seeds = [seed_gen.randint(MAX_SEED) for i in range(count)]
-        tasks = _make_simulator_tasks(seeds, starting_stn,
-                                      execution_strat, sim_options,
-                                      count)
-    else:
-        tasks = _make_simulator_tasks(None, starting_stn,
-                                      execution_strat, sim_options,
-                                      count)
+    # Spawned seed sequences give each simulation an independent random
+    # stream. A random_seed of None draws fresh entropy from the OS.
+    seed_seqs = np.random.SeedSequence(random_seed).spawn(count)
+    seeds = [int(seq.generate_state(1)[0]) for seq in seed_seqs]
+    tasks = _make_simulator_tasks(starting_stn, seeds, execution_strat,
+                                  sim_options, count)
 
     if threads > 1:
         print("Using multithreading; threads = {}".format(threads))
-        try_count = 0
-        while try_count <= 3:
-            try_count += 1
-            response = None
-            try:
-                with multiprocessing.Pool(threads) as pool:
-                    response = pool.map(_multisim_thread_helper, tasks)
-                break
-            except BlockingIOError:
-                pr.warning("Got BlockingIOError; attempting to remake threads")
-                pr.warning("Retrying in 3 seconds...")
-                time.sleep(3.0)
-                pr.warning("Retrying now")
+        # Hand each worker a batch of tasks at a time, rather than one. Every
+        # task in a batch refers to the same STN, so it is pickled once per
+        # batch.
+        chunksize = max(1, count // (threads * 4))
+        with ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(_make_pool(threads))
+            response = list(pool.imap_unordered(_multisim_thread_helper,
+                                                tasks, chunksize=chunksize))
     else:
         print("Using single thread; threads = {}".format(threads))
         response = list(map(_multisim_thread_helper, tasks))
 
+    # Results can come back in any order, so put them back in task order.
+    response.sort(key=lambda r: r[0])
     # Unzip each of the response values.
-    sample_results = [r[0] for r in response]
-    reschedules = [r[1] for r in response]
-    sent_schedules = [r[2] for r in response]
+    sample_results = [r[1] for r in response]
+    reschedules = [r[2] for r in response]
+    sent_schedules = [r[3] for r in response]
     # Package the response into a nice dict to send back.
     response_dict = {"sample_results": sample_results, "reschedules":
                      reschedules, "sent_schedules": sent_schedules}
     return response_dict
 
 
-def _make_simulator_tasks(seeds, stn, execution_strat, sim_options, count):
-    """Helper function to generate a list of tasks for the thread pool"""
-    if seeds is not None:
-        if execution_strat == "da":
-            tasks = [(DecoupledSimulator(seeds[i]), stn,
-                      execution_strat,
-                      sim_options, i)
-                     for i in range(count)]
-        else:
-            tasks = [(Simulator(seeds[i]), stn, execution_strat,
-                      sim_options, i)
-                     for i in range(count)]
-    else:
-        if execution_strat == "da":
-            tasks = [(DecoupledSimulator(None), stn,
-                      execution_strat,
-                      sim_options, i)
-                     for i in range(count)]
-        else:
-            tasks = [(Simulator(None), stn, execution_strat,
-                      sim_options, i)
-                     for i in range(count)]
-    return tasks
+def _make_pool(threads):
+    """Start a pool of worker processes for the simulations. Retries if the
+        system is temporarily out of processes.
+
+    Args:
+        threads (int): Number of worker processes.
+
+    Returns:
+        A multiprocessing Pool, to be used as a context manager.
+    """
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    for try_count in range(POOL_RETRIES + 1):
+        try:
+            return context.Pool(threads)
+        except BlockingIOError:
+            if try_count == POOL_RETRIES:
+                raise
+            pr.warning("Got BlockingIOError; attempting to remake threads")
+            pr.warning("Retrying in 3 seconds...")
+            time.sleep(3.0)
+            pr.warning("Retrying now")
+
+
+def _make_simulator_tasks(stn, seeds, execution_strat, sim_options, count):
+    """Helper function to generate a list of tasks for the thread pool.
+        Tasks only hold the seed for their simulator, which is built by the
+        worker.
+    """
+    return [(stn, seeds[i], execution_strat, sim_options, i)
+            for i in range(count)]
 
 
 def _multisim_thread_helper(tup):
     """ Helper function to allow passing multiple arguments to the simulator.
+
+    Returns:
+        A tuple of the task number, whether the simulation succeeded, the
+        number of reschedules and the number of sent schedules.
     """
-    simulator = tup[0]
-    if tup[2] == "da":
-        ans = simulator.simulate(tup[1], sim_options=tup[3],
+    stn, seed, execution_strat, sim_options, task_id = tup
+    # Simulators are built here, in the worker, so tasks stay small.
+    if execution_strat == "da":
+        simulator = DecoupledSimulator(seed)
+        ans = simulator.simulate(stn, sim_options=sim_options,
                                  decouple_type=DEFAULT_DECOUPLE)
     else:
-        ans = simulator.simulate(tup[1], tup[2], sim_options=tup[3])
+        simulator = Simulator(seed)
+        ans = simulator.simulate(stn, execution_strat,
+                                 sim_options=sim_options)
     reschedule_count = simulator.num_reschedules
     sent_count = simulator.num_sent_schedules
-    pr.verbose("Task: {}".format(tup[4]))
+    pr.verbose("Task: {}".format(task_id))
     pr.verbose("Assigned Times: {}".format(simulator.get_assigned_times()))
     pr.verbose("Successful?: {}".format(ans))
-    return ans, reschedule_count, sent_count
+    return task_id, ans, reschedule_count, sent_count
 
 
 def folder_harvest(folder_paths: list, recurse=True, only_json=True) -> list:
@@ -367,23 +500,23 @@ def folder_harvest(folder_paths: list, recurse=True, only_json=True) -> list:
                 stn_files.append(folder_path)
         elif os.path.isdir(folder_path):
             # This was actually a folder this time!
-            contents = os.listdir(folder_path)
-            for c in contents:
-                # Make sure to include the folder path
-                long_path = folder_path + "/" + c
-                if os.path.isfile(long_path):
-                    if only_json:
-                        _, ext = os.path.splitext(long_path)
-                        if ext == ".json":
-                            stn_files.append(long_path)
-                    else:
-                        stn_files.append(long_path)
-                elif os.path.isdir(long_path) and recurse:
-                    stn_files += folder_harvest([long_path], recurse=True)
+            # Walk it depth first, in listing order. Directory entries cache
+            # their file type, so this needs no extra stat calls per entry.
+            with os.scandir(folder_path) as contents:
+                pending = list(contents)
+            pending.reverse()
+            while pending:
+                entry = pending.pop()
+                if entry.is_file():
+                    if not only_json or entry.name.endswith(".json"):
+                        stn_files.append(entry.path)
+                elif entry.is_dir() and recurse:
+                    with os.scandir(entry.path) as contents:
+                        pending.extend(reversed(list(contents)))
                 else:
                     # This should never happen, but maybe?
                     pr.warning("STN path was not file or directory: " +
-                               folder_path)
+                               entry.path)
                     pr.warning("Skipping...")
         else:
             # This should never happen, but maybe?
@@ -395,12 +528,20 @@ def folder_harvest(folder_paths: list, recurse=True, only_json=True) -> list:
 
 def max_agent_verts(stn):
     """Returns the maximum amount of vertices belonging to any one agent"""
-    return max([get_agent_verts(stn, a) for a in stn.agents])
+    counts = _agent_vert_counts(stn)
+    return max(counts[a] for a in stn.agents)
 
 
 def mean_agent_verts(stn):
-    counts = [get_agent_verts(stn, a) for a in stn.agents]
-    return sum(counts)/len(counts)
+    counts = _agent_vert_counts(stn)
+    return sum(counts[a] for a in stn.agents)/len(stn.agents)
+
+
+def _agent_vert_counts(stn):
+    """Count the vertices owned by each agent ID in a single pass over the
+        STN's vertices.
+    """
+    return Counter(vert.ownerID for vert in stn.verts.values())
 
 
 def get_agent_verts(stn, agent):
@@ -421,8 +562,20 @@ def get_agent_verts(stn, agent):
     return count
 
 
-def parse_args():
-    """Parse the program arguments."""
+def parse_args(args=None):
+    """Parse the program arguments.
+
+    Args:
+        args (list, optional): Arguments to parse. Defaults to sys.argv.
+    """
+    return _build_parser().parse_args(args)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the argument parser. It is only built once, and reused by later
+        calls to parse_args.
+    """
     parser = argparse.ArgumentParser(description="")
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="Turns on more printing")
@@ -460,12 +613,19 @@ def parse_args():
                         "warned.")
     parser.add_argument("--no-live", action="store_true",
                         help="Turn off live update printing")
+    parser.add_argument("--timer-out", type=str,
+                        help="Save the time spent per function to this "
+                        "NumPy .npz file on exit")
     parser.add_argument("stns", help="The STN JSON files to run on",
                         nargs="+")
-    return parser.parse_args()
+    return parser
 
 
 if __name__ == "__main__":
+    try:
+        assert (sys.version_info >= (3, 0))
+    except AssertionError:
+        print("Simulations must be run with Python3 or a later version.")
     main()
     print("Time spent per function:")
     print(functiontimer.get_times())
@@ -0,0 +1,41 @@
+import os.path
+import tempfile
+import unittest
+
+import numpy as np
+
+from libheat import functiontimer
+
+
+class TestSaveTimes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        saved_times = dict(functiontimer.func_total_times)
+        self.addCleanup(self.restore_times, saved_times)
+        functiontimer.func_total_times.clear()
+        self.path = os.path.join(self.tmpdir.name, "times.npz")
+
+    def restore_times(self, saved_times):
+        functiontimer.func_total_times.clear()
+        functiontimer.func_total_times.update(saved_times)
+
+    def test_save_times(self):
+        functiontimer.func_total_times["get_guide"] = 1.5
+        functiontimer.func_total_times["propagation & check"] = 0.25
+        functiontimer.save_times(self.path)
+        with np.load(self.path) as saved:
+            self.assertEqual(saved["names"].tolist(),
+                             ["get_guide", "propagation & check"])
+            self.assertEqual(saved["seconds"].dtype, np.float64)
+            self.assertEqual(saved["seconds"].tolist(), [1.5, 0.25])
+
+    def test_save_no_times(self):
+        functiontimer.save_times(self.path)
+        with np.load(self.path) as saved:
+            self.assertEqual(saved["names"].shape, (0,))
+            self.assertEqual(saved["seconds"].shape, (0,))
+
+if __name__ == "__main__":
+    unittest.main()
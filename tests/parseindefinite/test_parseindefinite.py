@@ -0,0 +1,29 @@
+import unittest
+
+import numpy as np
+
+from libheat.parseindefinite import parse_ind_arg
+
+
+class TestParseIndefinite(unittest.TestCase):
+
+    def test_parse_pairs(self):
+        pairs = parse_ind_arg("[(0.0,0.5), (0.25, 1.0)]")
+        self.assertEqual(pairs.shape, (2, 2))
+        self.assertEqual(pairs.dtype, np.float64)
+        self.assertEqual(pairs[:, 0].tolist(), [0.0, 0.25])
+        self.assertEqual(pairs[:, 1].tolist(), [0.5, 1.0])
+
+    def test_parse_empty(self):
+        self.assertEqual(parse_ind_arg("[]").shape, (0, 2))
+
+    def test_bad_pairs(self):
+        with self.assertRaises(ValueError):
+            parse_ind_arg("(0.0,0.5)")
+        with self.assertRaises(ValueError):
+            parse_ind_arg("[(0.0,0.5,1.0)]")
+        with self.assertRaises(ValueError):
+            parse_ind_arg("[(0.5)]")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from libheat.plotting.plot_utils import clearzero, framefilters
+
+
+def make_frame():
+    return pd.DataFrame({
+        "stn_path": ["p/STN_a2_i4_s3_t3000/original_0.json",
+                     "p/STN_a2_i4_s3_t3000/original_0.json",
+                     "p/STN_a2_i4_s3_t5000/original_1.json",
+                     "p/STN_a2_i4_s3_t5000/original_1.json",
+                     "p/other/original_2.json"],
+        "execution": ["srea", "drea", "srea", "drea", "drea"],
+        "robustness": [0.0, 0.0, 0.0, 0.5, 0.25],
+        "samples": [100, 100, 100, 100, 100]})
+
+
+class TestPlotUtils(unittest.TestCase):
+    def test_clearzero(self):
+        df = clearzero(make_frame())
+        self.assertEqual(list(df.index), [2, 3, 4])
+
+    def test_framefilters_sync_deg(self):
+        df = framefilters(make_frame())
+        self.assertEqual(list(df.index), [2, 3, 4])
+        self.assertEqual(list(df["sync_deg"][:2]), [5.0, 5.0])
+        self.assertTrue(np.isnan(df["sync_deg"].iloc[2]))
+
+    def test_framefilters_samples(self):
+        frame = make_frame()
+        frame.loc[3, "samples"] = 20
+        df = framefilters(frame)
+        self.assertEqual(list(df.index), [2, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os.path
+import tempfile
+import unittest
+
+from libheat import sim2csv
+
+
+ROWS = [{"execution": "drea", "robustness": 0.7, "samples": 40,
+         "stn_path": "a/b.json", "stn_name": "b, with comma"},
+        {"execution": "drea", "robustness": 0.25, "samples": 40,
+         "stn_path": "a/c.json", "stn_name": "c"}]
+
+
+class TestCSVRowWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def read(self, name):
+        with open(self.path(name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_new_file(self):
+        with sim2csv.CSVRowWriter(self.path("writer.csv")) as writer:
+            for row in ROWS:
+                writer.write_row(row)
+        for row in ROWS:
+            sim2csv.save_csv_row(row, self.path("pandas.csv"))
+        lines = self.read("writer.csv").splitlines()
+        self.assertEqual(lines[0], ",".join(ROWS[0]))
+        self.assertEqual(len(lines), 1 + len(ROWS))
+        self.assertEqual(self.read("writer.csv"), self.read("pandas.csv"))
+
+    def test_existing_file(self):
+        for name in ("writer.csv", "pandas.csv"):
+            sim2csv.save_csv_row(ROWS[0], self.path(name))
+        with sim2csv.CSVRowWriter(self.path("writer.csv")) as writer:
+            writer.write_row(ROWS[1])
+        sim2csv.save_csv_row(ROWS[1], self.path("pandas.csv"))
+        lines = self.read("writer.csv").splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(self.read("writer.csv"), self.read("pandas.csv"))
+
+    def test_no_rows(self):
+        with sim2csv.CSVRowWriter(self.path("writer.csv")):
+            pass
+        self.assertFalse(os.path.exists(self.path("writer.csv")))
+
+    def test_empty_existing_file(self):
+        open(self.path("writer.csv"), "w").close()
+        with sim2csv.CSVRowWriter(self.path("writer.csv")) as writer:
+            for row in ROWS:
+                writer.write_row(row)
+        for row in ROWS:
+            sim2csv.save_csv_row(row, self.path("pandas.csv"))
+        self.assertEqual(self.read("writer.csv"), self.read("pandas.csv"))
+
+if __name__ == "__main__":
+    unittest.main()